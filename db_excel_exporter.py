@@ -2,17 +2,185 @@
 
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+import numpy as np
 import pandas as pd
+import xlsxwriter
+import tempfile
+import io
+import re
+import hashlib
+import itertools
 from typing import Optional, Union, List, Dict, Any
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from datetime import datetime
+import threading
+import queue
+import atexit
+import weakref
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow é opcional: sem ele, larguras são medidas pelo NumPy
+    pa = pc = None
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pools compartilhados entre instâncias, indexados pelos parâmetros de conexão
+_POOL_CACHE: Dict[tuple, pool.ThreadedConnectionPool] = {}
+_POOL_CACHE_LOCK = threading.Lock()
+
+
+def _get_shared_pool(
+        connection_params: Dict[str, Any],
+        min_conn: int,
+        max_conn: int
+) -> pool.ThreadedConnectionPool:
+    """Retorna o pool compartilhado para os parâmetros, criando-o se necessário."""
+    key = tuple(sorted(connection_params.items()))
+    with _POOL_CACHE_LOCK:
+        connection_pool = _POOL_CACHE.get(key)
+        if connection_pool is None or connection_pool.closed:
+            connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                min_conn,
+                max_conn,
+                **connection_params
+            )
+            _POOL_CACHE[key] = connection_pool
+        return connection_pool
+
+
+def _close_all_pools():
+    """Fecha todos os pools compartilhados (registrado no atexit)."""
+    with _POOL_CACHE_LOCK:
+        for connection_pool in _POOL_CACHE.values():
+            if not connection_pool.closed:
+                connection_pool.closeall()
+        _POOL_CACHE.clear()
+
+
+atexit.register(_close_all_pools)
+
+# Statements preparados por conexão {conexão: {query: nome}}. Fica junto da
+# conexão (e não do exporter) porque pools compartilhados a repassam entre
+# instâncias; entradas somem quando o pool descarta a conexão.
+_PREPARED_STATEMENTS: "weakref.WeakKeyDictionary[Any, Dict[str, str]]" = weakref.WeakKeyDictionary()
+_PREPARED_STATEMENTS_LOCK = threading.Lock()
+
+# Placeholders do psycopg2 (%s) e escapes (%%) a converter para PREPARE
+_PLACEHOLDER_RE = re.compile(r'%(%|s)')
+
+
+def _to_prepare_sql(query: str) -> str:
+    """Converte placeholders %s em $1, $2, ... para uso em PREPARE."""
+    counter = itertools.count(1)
+    return _PLACEHOLDER_RE.sub(
+        lambda m: '%' if m.group(1) == '%' else f'${next(counter)}',
+        query
+    )
+
+
+# OIDs de tipos do PostgreSQL (pg_type) usados para tipar o resultado do COPY;
+# os demais (text, varchar, uuid, json, ...) permanecem texto
+_NUMERIC_OIDS = {20, 21, 23, 700, 701, 1700}
+_BOOL_OIDS = {16}
+_DATE_OIDS = {1082, 1114}
+_TIMESTAMPTZ_OIDS = {1184}
+
+# Valores especiais de float8/numeric como o PostgreSQL os imprime no COPY
+_COPY_SPECIAL_FLOATS = {'NaN': np.nan, 'Infinity': np.inf, '-Infinity': -np.inf}
+
+# Marcador de NULL no COPY; o texto literal \N também é lido como nulo
+_COPY_NULL = '\\N'
+
+
+def _quote_ident(name: str) -> str:
+    """Cita um identificador SQL (nome de coluna) com aspas duplas."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _aggregate_sql(query: str, aggregate: Dict[str, Any]) -> str:
+    """
+    Envolve a query em um SELECT ... GROUP BY executado pelo servidor.
+
+    aggregate: {'group_by': [colunas], 'metrics': {alias: expressão SQL}};
+    ao menos uma das duas chaves deve ser informada.
+    """
+    group_cols = ', '.join(_quote_ident(col) for col in aggregate.get('group_by', []))
+    metrics = ', '.join(
+        f'{expr} AS {_quote_ident(alias)}' for alias, expr in aggregate.get('metrics', {}).items()
+    )
+    if not group_cols and not metrics:
+        raise ValueError("aggregate precisa de 'group_by' e/ou 'metrics' não vazios")
+    select = ', '.join(part for part in (group_cols, metrics) if part)
+    # ')' em nova linha: um '-- comentário' final não o engole
+    sql = f'SELECT {select} FROM ({query.strip().rstrip(";")}\n) q'
+    if group_cols:
+        sql += f' GROUP BY {group_cols}'
+    return sql
+
+
+# Limites de uma planilha do Excel (linhas, colunas)
+_EXCEL_MAX_ROWS = 1_048_576
+_EXCEL_MAX_COLS = 16_384
+
+# Tipos que o xlsxwriter grava nativamente; o resto vira texto, como no pandas
+_EXCEL_NATIVE_TYPES = (bool, int, float, Decimal, str, date, datetime, timedelta)
+
+
+def _excel_value(value):
+    """
+    Converte um valor para o xlsxwriter como faz o ExcelWriter do pandas.
+
+    Nulos (None, NaN, NaT, NA) viram célula vazia, infinitos viram 'inf'/'-inf',
+    horários (time) viram texto ISO e tipos não suportados (uuid, dict, list,
+    ...) são gravados com str(). Datetimes com fuso horário geram ValueError,
+    pois o pandas também os recusa.
+    """
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value in (float('inf'), float('-inf')):
+            return str(value)
+    if isinstance(value, Decimal) and not value.is_finite():
+        return None if value.is_nan() else str(float(value))
+    if isinstance(value, time):
+        return value.isoformat()
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        raise ValueError(
+            "Excel não suporta datetimes com fuso horário; "
+            "remova o fuso (ex.: tz_localize(None)) antes de exportar"
+        )
+    if isinstance(value, _EXCEL_NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def _write_excel_row(worksheet, row_idx: int, row, cell_formats: Dict[str, Any]) -> None:
+    """
+    Escreve uma linha com _excel_value, usando os formatos de _cell_formats.
+
+    Datetimes recebem data e hora; timedeltas viram número de dias com
+    formato '0', como no ExcelWriter do pandas.
+    """
+    for col_idx, value in enumerate(row):
+        value = _excel_value(value)
+        if isinstance(value, datetime):
+            worksheet.write_datetime(row_idx, col_idx, value, cell_formats['datetime'])
+        elif isinstance(value, timedelta):
+            worksheet.write_number(row_idx, col_idx, value.total_seconds() / 86400, cell_formats['timedelta'])
+        else:
+            worksheet.write(row_idx, col_idx, value)
+
 
 class PostgreSQLExporter:
     """
@@ -36,6 +204,9 @@ class PostgreSQLExporter:
         )
     """
 
+    # Acima deste número de linhas, dataframe_to_excel escreve via xlsxwriter direto
+    STREAM_THRESHOLD = 50_000
+
     def __init__(
             self,
             host: str,
@@ -44,7 +215,11 @@ class PostgreSQLExporter:
             password: str,
             port: int = 5432,
             min_conn: int = 1,
-            max_conn: int = 10
+            max_conn: int = 10,
+            itersize: int = 10_000,
+            shared_pool: bool = False,
+            application_name: str = 'db_excel_exporter',
+            statement_timeout_ms: Optional[int] = None
     ):
         """
         Inicializa a conexão com PostgreSQL usando pool de conexões.
@@ -55,23 +230,44 @@ class PostgreSQLExporter:
             user: Usuário do banco
             password: Senha do usuário
             port: Porta do PostgreSQL (padrão: 5432)
-            min_conn: Mínimo de conexões no pool
+            min_conn: Mínimo de conexões no pool (e de conexões ociosas mantidas
+                abertas). Atrás de PgBouncer, use 0 para não reter conexões
             max_conn: Máximo de conexões no pool
+            itersize: Linhas buscadas por lote no cursor server-side. Use 0
+                (fetchall) para resultados de até ~1000 linhas e 50_000 para
+                resultados acima de 10^5 linhas
+            shared_pool: Reutilizar o pool compartilhado do módulo para os
+                mesmos parâmetros de conexão; close() não o fecha
+            application_name: Nome da aplicação exibido em pg_stat_activity
+            statement_timeout_ms: Tempo máximo por query em ms (padrão: sem limite)
         """
+        self.shared_pool = shared_pool
+        self.default_itersize = itersize
         self.connection_params = {
             'host': host,
             'database': database,
             'user': user,
             'password': password,
-            'port': port
+            'port': port,
+            'application_name': application_name,
+            # Keepalives TCP mantêm vivas as conexões ociosas do pool (NAT/PgBouncer)
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 5
         }
+        if statement_timeout_ms is not None:
+            self.connection_params['options'] = f'-c statement_timeout={statement_timeout_ms}'
 
         try:
-            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                min_conn,
-                max_conn,
-                **self.connection_params
-            )
+            if shared_pool:
+                self.connection_pool = _get_shared_pool(self.connection_params, min_conn, max_conn)
+            else:
+                self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                    min_conn,
+                    max_conn,
+                    **self.connection_params
+                )
             logger.info(f"Pool de conexões criado com sucesso para {database}@{host}")
         except Exception as e:
             logger.error(f"Erro ao criar pool de conexões: {e}")
@@ -84,13 +280,58 @@ class PostgreSQLExporter:
         try:
             yield conn
         finally:
-            self.connection_pool.putconn(conn)
+            # Conexões quebradas são descartadas; as saudáveis voltam ao pool
+            self.connection_pool.putconn(conn, close=bool(conn.closed))
+
+    @contextmanager
+    def get_named_cursor(
+            self,
+            conn,
+            cursor_factory=None,
+            name: str = 'export_cur',
+            itersize: Optional[int] = None
+    ):
+        """
+        Context manager para cursor nomeado (server-side).
+
+        Cursores nomeados exigem uma transação aberta; ela é encerrada
+        (rollback) ao sair, devolvendo a conexão limpa ao pool.
+        """
+        if conn.autocommit:
+            conn.autocommit = False
+        cursor = conn.cursor(name=name, cursor_factory=cursor_factory)
+        cursor.itersize = itersize or self.default_itersize
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            conn.rollback()
+
+    def _prepare(self, conn, cursor, query: str) -> str:
+        """
+        Prepara a query na conexão (uma vez por conexão) e retorna o nome do statement.
+
+        Statements preparados vivem na sessão, então o registro é por conexão
+        (_PREPARED_STATEMENTS) e vale para qualquer instância que a receba.
+        """
+        with _PREPARED_STATEMENTS_LOCK:
+            statements = _PREPARED_STATEMENTS.setdefault(conn, {})
+
+        name = statements.get(query)
+        if name is None:
+            name = 'p_' + hashlib.sha1(query.encode()).hexdigest()[:16]
+            cursor.execute(f'PREPARE {name} AS {_to_prepare_sql(query)}')
+            statements[query] = name
+        return name
 
     def execute_query(
             self,
             query: str,
             params: Optional[tuple] = None,
-            as_dict: bool = True
+            as_dict: bool = False,
+            itersize_hint: Optional[int] = None,
+            prepare: bool = False,
+            work_mem: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Executa uma query SELECT e retorna os resultados em DataFrame.
@@ -98,32 +339,74 @@ class PostgreSQLExporter:
         Args:
             query: Query SQL a ser executada
             params: Parâmetros para query parametrizada (opcional)
-            as_dict: Se True, usa DictCursor para colunas nomeadas
+            as_dict: Se True, monta o DataFrame por colunas (dict de listas);
+                por padrão as tuplas vão direto para DataFrame.from_records
+            itersize_hint: Linhas por lote nesta query (padrão: default_itersize).
+                0 usa cursor client-side com fetchall, mais rápido para
+                resultados pequenos
+            prepare: Reutilizar um statement preparado (PREPARE/EXECUTE) na
+                conexão, evitando parse/plan em queries repetidas com
+                parâmetros diferentes. Usa cursor client-side (EXECUTE não
+                pode ser usado em DECLARE CURSOR); params em dict geram ValueError
+            work_mem: work_mem da transação (ex.: '256MB'), útil para
+                agregações grandes (HashAggregate) no servidor
 
         Returns:
             DataFrame do pandas com os resultados
         """
+        itersize = self.default_itersize if itersize_hint is None else itersize_hint
+        # PREPARE só aceita parâmetros posicionais ($1, $2, ...)
+        if prepare and isinstance(params, dict):
+            raise ValueError("prepare=True exige parâmetros posicionais (tuple/list), não dict")
+
         try:
             with self.get_connection() as conn:
-                cursor_factory = RealDictCursor if as_dict else None
+                if itersize and not prepare:
+                    cursor_cm = self.get_named_cursor(conn, itersize=itersize)
+                else:
+                    cursor_cm = conn.cursor()
 
-                with conn.cursor(cursor_factory=cursor_factory) as cursor:
-                    logger.info(f"Executando query: {query[:100]}...")
-                    cursor.execute(query, params)
-
-                    # Buscar resultados
-                    results = cursor.fetchall()
+                with cursor_cm as cursor:
+                    if work_mem:
+                        # is_local=true: vale só para esta transação, não vaza para o pool
+                        with conn.cursor() as setup_cursor:
+                            setup_cursor.execute("SELECT set_config('work_mem', %s, true)", (work_mem,))
 
-                    # Obter nomes das colunas
-                    if as_dict:
-                        columns = results[0].keys() if results else []
-                        data = [dict(row) for row in results]
+                    logger.info(f"Executando query: {query[:100]}...")
+                    if prepare:
+                        name = self._prepare(conn, cursor, query)
+                        if params:
+                            placeholders = ', '.join(['%s'] * len(params))
+                            cursor.execute(f'EXECUTE {name} ({placeholders})', params)
+                        else:
+                            cursor.execute(f'EXECUTE {name}')
                     else:
-                        columns = [desc[0] for desc in cursor.description]
-                        data = results
+                        cursor.execute(query, params)
+
+                    # Buscar resultados em lotes (memória O(lote) por vez)
+                    chunks = []
+                    while True:
+                        rows = cursor.fetchmany(itersize) if itersize else cursor.fetchall()
+                        if not rows:
+                            break
+                        columns = [desc.name for desc in cursor.description]
+                        if as_dict:
+                            # Transpõe as tuplas em colunas (dict de listas)
+                            data = {col: list(values) for col, values in zip(columns, zip(*rows))}
+                            chunks.append(pd.DataFrame(data, copy=False))
+                        else:
+                            chunks.append(pd.DataFrame.from_records(rows, columns=columns, coerce_float=False))
 
                     # Criar DataFrame
-                    df = pd.DataFrame(data, columns=columns)
+                    if not chunks:
+                        columns = [desc.name for desc in cursor.description or []]
+                        df = pd.DataFrame(columns=columns)
+                    elif len(chunks) == 1:
+                        df = chunks[0]
+                    else:
+                        # Lotes são tipados separadamente (ex.: um lote só de NULL vira
+                        # object); reinferir para não depender do tamanho do lote
+                        df = pd.concat(chunks, ignore_index=True).infer_objects()
                     logger.info(f"Query executada com sucesso. Linhas retornadas: {len(df)}")
 
                     return df
@@ -132,6 +415,83 @@ class PostgreSQLExporter:
             logger.error(f"Erro ao executar query: {e}")
             raise
 
+    def execute_query_copy(
+            self,
+            query: str,
+            params: Optional[tuple] = None
+    ) -> pd.DataFrame:
+        """
+        Executa a query via COPY ... TO STDOUT e retorna DataFrame.
+
+        O resultado chega em um único fluxo, sem o custo por linha do
+        protocolo de SELECT. Indicado para extrações do tipo SELECT * sem
+        pós-processamento. Os tipos das colunas vêm do cursor.description
+        (números, booleanos e datas são convertidos; o resto fica como texto,
+        preservando zeros à esquerda e distinguindo '' de NULL).
+
+        Args:
+            query: Query SQL a ser executada
+            params: Parâmetros para query parametrizada (opcional)
+
+        Returns:
+            DataFrame do pandas com os resultados
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    # COPY não aceita parâmetros: interpolar com escape do psycopg2
+                    query = query.strip().rstrip(';')
+                    # COPY emite os bytes no encoding do cliente
+                    encoding = psycopg2.extensions.encodings[conn.encoding]
+                    bound_query = cursor.mogrify(query, params).decode(encoding)
+                    logger.info(f"Executando COPY: {bound_query[:100]}...")
+
+                    # Nomes e tipos das colunas, sem trazer linhas
+                    # ')' em nova linha: um '-- comentário' final não o engole
+                    cursor.execute(f'SELECT * FROM ({bound_query}\n) q LIMIT 0')
+                    description = cursor.description
+
+                    buffer = io.BytesIO()
+                    cursor.copy_expert(
+                        f"COPY ({bound_query}\n) TO STDOUT WITH (FORMAT CSV, NULL '{_COPY_NULL}')",
+                        buffer
+                    )
+                conn.rollback()
+
+            columns = [desc.name for desc in description]
+            if not buffer.getbuffer().nbytes:
+                df = pd.DataFrame(columns=columns)
+            else:
+                buffer.seek(0)
+                # Tudo como texto; só o marcador de NULL vira nulo
+                df = pd.read_csv(
+                    buffer,
+                    header=None,
+                    encoding=encoding,
+                    dtype=str,
+                    keep_default_na=False,
+                    na_values=[_COPY_NULL]
+                )
+                for i, desc in enumerate(description):
+                    col = df.iloc[:, i]
+                    if desc.type_code in _NUMERIC_OIDS:
+                        df.isetitem(i, pd.to_numeric(col.replace(_COPY_SPECIAL_FLOATS)))
+                    elif desc.type_code in _BOOL_OIDS:
+                        df.isetitem(i, col.map({'t': True, 'f': False}))
+                    elif desc.type_code in _DATE_OIDS:
+                        df.isetitem(i, pd.to_datetime(col))
+                    elif desc.type_code in _TIMESTAMPTZ_OIDS:
+                        df.isetitem(i, pd.to_datetime(col, utc=True))
+                # Atribuído depois da leitura para manter nomes duplicados (sem 'id.1')
+                df.columns = columns
+
+            logger.info(f"COPY executado com sucesso. Linhas retornadas: {len(df)}")
+            return df
+
+        except Exception as e:
+            logger.error(f"Erro ao executar COPY: {e}")
+            raise
+
     def query_to_excel(
             self,
             query: str,
@@ -140,7 +500,10 @@ class PostgreSQLExporter:
             sheet_name: str = 'Dados',
             include_index: bool = False,
             auto_adjust_columns: bool = True,
-            freeze_header: bool = True
+            freeze_header: bool = True,
+            prepare: bool = False,
+            aggregate: Optional[Dict[str, Any]] = None,
+            work_mem: Optional[str] = None
     ) -> str:
         """
         Executa query e salva resultado diretamente em arquivo Excel.
@@ -153,13 +516,21 @@ class PostgreSQLExporter:
             include_index: Incluir índice do DataFrame no Excel
             auto_adjust_columns: Ajustar largura das colunas automaticamente
             freeze_header: Congelar primeira linha (cabeçalho)
+            prepare: Reutilizar statement preparado (ver execute_query)
+            aggregate: Agregação executada no servidor sobre o resultado da
+                query, no formato {'group_by': ['coluna', ...],
+                'metrics': {'alias': 'COUNT(*)', ...}}
+            work_mem: work_mem da transação (ex.: '256MB') para agregações grandes
 
         Returns:
             Caminho do arquivo gerado
         """
         try:
+            if aggregate is not None:
+                query = _aggregate_sql(query, aggregate)
+
             # Executar query
-            df = self.execute_query(query, params)
+            df = self.execute_query(query, params, prepare=prepare, work_mem=work_mem)
 
             # Salvar em Excel
             return self.dataframe_to_excel(
@@ -175,6 +546,142 @@ class PostgreSQLExporter:
             logger.error(f"Erro ao exportar para Excel: {e}")
             raise
 
+    def query_to_excel_stream(
+            self,
+            query: str,
+            output_file: str,
+            params: Optional[tuple] = None,
+            sheet_name: str = 'Dados',
+            auto_adjust_columns: bool = True,
+            freeze_header: bool = True,
+            batch_size: Optional[int] = None
+    ) -> str:
+        """
+        Executa query e grava as linhas direto no Excel, sem DataFrame intermediário.
+
+        Usa xlsxwriter com constant_memory=True: cada lote lido do cursor
+        server-side é escrito e descartado, mantendo a memória em O(lote).
+        O próximo lote é buscado em segundo plano enquanto o atual é escrito.
+        Resultados acima do limite de linhas do Excel geram ValueError.
+        A largura das colunas é estimada pelo primeiro lote (máximo 50).
+
+        Args:
+            query: Query SQL a ser executada
+            output_file: Caminho do arquivo Excel de saída
+            params: Parâmetros para query parametrizada
+            sheet_name: Nome da aba do Excel
+            auto_adjust_columns: Ajustar largura das colunas pelo primeiro lote
+            freeze_header: Congelar primeira linha (cabeçalho)
+            batch_size: Linhas buscadas por lote (padrão: default_itersize)
+
+        Returns:
+            Caminho do arquivo gerado
+        """
+        try:
+            workbook = self._open_stream_workbook(output_file)
+            try:
+                worksheet = workbook.add_worksheet(sheet_name)
+                header_format = self._header_format(workbook)
+
+                batch_size = batch_size or self.default_itersize or 10_000
+                with self.get_connection() as conn:
+                    with self.get_named_cursor(conn, itersize=batch_size) as cursor:
+                        logger.info(f"Executando query: {query[:100]}...")
+                        cursor.execute(query, params)
+
+                        rows = cursor.fetchmany(batch_size)
+                        columns = [desc[0] for desc in cursor.description]
+                        if len(columns) > _EXCEL_MAX_COLS:
+                            raise ValueError(
+                                f"Planilha grande demais: {len(columns)} colunas (máximo {_EXCEL_MAX_COLS})"
+                            )
+
+                        # Larguras precisam ser definidas antes da escrita das linhas
+                        if auto_adjust_columns:
+                            for col_idx, col in enumerate(columns):
+                                max_length = max(
+                                    [len(str(row[col_idx])) for row in rows] + [len(str(col))]
+                                )
+                                worksheet.set_column(col_idx, col_idx, min(max_length + 2, 50))
+
+                        worksheet.write_row(0, 0, columns, header_format)
+
+                        if freeze_header:
+                            worksheet.freeze_panes(1, 0)
+
+                        # Valores convertidos como no ExcelWriter do pandas (uuid, json, NaN...)
+                        cell_formats = self._cell_formats(workbook)
+                        row_idx = 1
+                        with self._prefetch_batches(cursor, batch_size) as batches:
+                            for batch in itertools.chain([rows], batches):
+                                for row in batch:
+                                    # xlsxwriter ignora linhas além do limite sem erro
+                                    if row_idx >= _EXCEL_MAX_ROWS:
+                                        raise ValueError(
+                                            f"Resultado excede o limite de {_EXCEL_MAX_ROWS - 1} "
+                                            f"linhas de dados de uma planilha do Excel"
+                                        )
+                                    _write_excel_row(worksheet, row_idx, row, cell_formats)
+                                    row_idx += 1
+            finally:
+                workbook.close()
+
+            logger.info(f"Arquivo Excel criado com sucesso: {output_file} ({row_idx - 1} linhas)")
+            return output_file
+
+        except Exception as e:
+            logger.error(f"Erro ao exportar para Excel (streaming): {e}")
+            raise
+
+    @contextmanager
+    def _prefetch_batches(self, cursor, batch_size: int, max_pending: int = 4):
+        """
+        Busca lotes do cursor em uma thread de fundo e os entrega por um iterador.
+
+        A leitura da rede (libpq libera o GIL) se sobrepõe ao processamento
+        do lote anterior; a fila limitada mantém no máximo `max_pending`
+        lotes em memória. Erros da busca são relançados no consumidor.
+        """
+        batches = queue.Queue(maxsize=max_pending)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def producer():
+            try:
+                while not stop.is_set():
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    put(rows)
+                put(None)
+            except Exception as e:
+                put(e)
+
+        def consume():
+            while True:
+                item = batches.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+        thread = threading.Thread(target=producer, daemon=True)
+        thread.start()
+        try:
+            yield consume()
+        finally:
+            # O cursor só pode ser fechado depois que a thread terminar
+            stop.set()
+            thread.join()
+
     def dataframe_to_excel(
             self,
             df: pd.DataFrame,
@@ -187,6 +694,9 @@ class PostgreSQLExporter:
         """
         Salva DataFrame em arquivo Excel com formatação.
 
+        DataFrames com mais de STREAM_THRESHOLD linhas são gravados pelo
+        xlsxwriter direto em modo constant_memory, sem o ExcelWriter do pandas.
+
         Args:
             df: DataFrame a ser salvo
             output_file: Caminho do arquivo de saída
@@ -199,37 +709,47 @@ class PostgreSQLExporter:
             Caminho do arquivo gerado
         """
         try:
+            if len(df) > self.STREAM_THRESHOLD:
+                return self._dataframe_to_excel_stream(
+                    df,
+                    output_file,
+                    sheet_name,
+                    include_index,
+                    auto_adjust_columns,
+                    freeze_header
+                )
+
             with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
+                # Cabeçalho é escrito uma única vez, já formatado, abaixo
                 df.to_excel(
                     writer,
                     sheet_name=sheet_name,
-                    index=include_index
+                    index=include_index,
+                    header=False,
+                    startrow=1
                 )
 
                 workbook = writer.book
                 worksheet = writer.sheets[sheet_name]
 
                 # Formato para cabeçalho
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#4472C4',
-                    'font_color': 'white',
-                    'border': 1
-                })
-
-                # Aplicar formato ao cabeçalho
+                header_format = self._header_format(workbook)
+
+                # Aplicar formato ao cabeçalho (com header=False o pandas omite o nome do índice)
+                offset = df.index.nlevels if include_index else 0
+                if include_index:
+                    for level, name in enumerate(df.index.names):
+                        if name is not None:
+                            worksheet.write(0, level, name, header_format)
                 for col_num, value in enumerate(df.columns.values):
-                    worksheet.write(0, col_num + (1 if include_index else 0), value, header_format)
+                    worksheet.write(0, col_num + offset, value, header_format)
 
                 # Ajustar largura das colunas
                 if auto_adjust_columns:
-                    for i, col in enumerate(df.columns):
-                        col_idx = i + (1 if include_index else 0)
-                        max_length = max(
-                            df[col].astype(str).apply(len).max(),
-                            len(str(col))
-                        )
-                        worksheet.set_column(col_idx, col_idx, min(max_length + 2, 50))
+                    widths = self._column_widths(df)
+                    for i, (col, width) in enumerate(zip(df.columns, widths)):
+                        max_length = max(width, len(str(col)))
+                        worksheet.set_column(i + offset, i + offset, min(max_length + 2, 50))
 
                 # Congelar primeira linha
                 if freeze_header:
@@ -242,6 +762,108 @@ class PostgreSQLExporter:
             logger.error(f"Erro ao criar arquivo Excel: {e}")
             raise
 
+    def _dataframe_to_excel_stream(
+            self,
+            df: pd.DataFrame,
+            output_file: str,
+            sheet_name: str,
+            include_index: bool,
+            auto_adjust_columns: bool,
+            freeze_header: bool
+    ) -> str:
+        """Grava DataFrame linha a linha com xlsxwriter em modo constant_memory."""
+        # xlsxwriter ignora células fora dos limites sem erro; o pandas levanta
+        n_rows = len(df) + 1
+        n_cols = len(df.columns) + (1 if include_index else 0)
+        if n_rows > _EXCEL_MAX_ROWS or n_cols > _EXCEL_MAX_COLS:
+            raise ValueError(
+                f"Planilha grande demais: {n_rows} linhas x {n_cols} colunas "
+                f"(máximo {_EXCEL_MAX_ROWS} x {_EXCEL_MAX_COLS})"
+            )
+
+        workbook = self._open_stream_workbook(output_file)
+        try:
+            worksheet = workbook.add_worksheet(sheet_name)
+            offset = 1 if include_index else 0
+
+            # Larguras precisam ser definidas antes da escrita das linhas
+            if auto_adjust_columns:
+                widths = self._column_widths(df)
+                for i, (col, width) in enumerate(zip(df.columns, widths)):
+                    max_length = max(width, len(str(col)))
+                    worksheet.set_column(i + offset, i + offset, min(max_length + 2, 50))
+
+            header = [_excel_value(col) for col in df.columns]
+            if include_index:
+                # itertuples junta os níveis do índice em uma única coluna
+                index_label = df.index.name if df.index.nlevels == 1 else tuple(df.index.names)
+                header.insert(0, _excel_value(index_label))
+            worksheet.write_row(0, 0, header, self._header_format(workbook))
+
+            if freeze_header:
+                worksheet.freeze_panes(1, 0)
+
+            cell_formats = self._cell_formats(workbook)
+            for row_idx, row in enumerate(df.itertuples(index=include_index, name=None), start=1):
+                _write_excel_row(worksheet, row_idx, row, cell_formats)
+        finally:
+            workbook.close()
+
+        logger.info(f"Arquivo Excel criado com sucesso (streaming): {output_file}")
+        return output_file
+
+    @staticmethod
+    def _open_stream_workbook(output_file: str) -> xlsxwriter.Workbook:
+        """Abre workbook xlsxwriter em modo constant_memory (escrita linha a linha)."""
+        return xlsxwriter.Workbook(output_file, {
+            'constant_memory': True,
+            'tmpdir': tempfile.gettempdir(),
+            'default_date_format': 'yyyy-mm-dd'
+        })
+
+    @staticmethod
+    def _cell_formats(workbook) -> Dict[str, Any]:
+        """Formatos de data e hora e de timedelta, iguais aos do ExcelWriter do pandas."""
+        return {
+            'datetime': workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'}),
+            'timedelta': workbook.add_format({'num_format': '0'})
+        }
+
+    @staticmethod
+    def _header_format(workbook):
+        """Formato padrão do cabeçalho."""
+        return workbook.add_format({
+            'bold': True,
+            'bg_color': '#4472C4',
+            'font_color': 'white',
+            'border': 1
+        })
+
+    @staticmethod
+    def _column_widths(df: pd.DataFrame, sample_rows: int = 1000) -> np.ndarray:
+        """
+        Calcula o maior comprimento de texto de cada coluna do DataFrame.
+
+        Usa apenas as primeiras `sample_rows` linhas: a largura legível
+        raramente muda depois disso e o custo fica limitado a O(amostra).
+        Colunas de texto são medidas pelo pyarrow (utf8_length em C) quando
+        disponível.
+        """
+        sample = df.head(sample_rows)
+        widths = np.zeros(len(df.columns), dtype=np.int32)
+        if sample.empty:
+            return widths
+
+        str_lens = np.vectorize(lambda x: len(str(x)) if x is not None else 0, otypes=[np.int32])
+        for i in range(len(sample.columns)):
+            series = sample.iloc[:, i]
+            if pc is not None and pd.api.types.is_string_dtype(series):
+                lengths = pc.utf8_length(pa.array(series, from_pandas=True))
+                widths[i] = pc.max(lengths).as_py() or 0
+            else:
+                widths[i] = str_lens(series.to_numpy(dtype=object)).max()
+        return widths
+
     def multiple_queries_to_excel(
             self,
             queries: Dict[str, str],
@@ -251,6 +873,10 @@ class PostgreSQLExporter:
         """
         Executa múltiplas queries e salva cada uma em uma aba diferente do Excel.
 
+        As queries rodam em paralelo, cada thread com sua própria conexão do
+        pool; a escrita no Excel é feita depois, em série (xlsxwriter não é
+        thread-safe).
+
         Args:
             queries: Dicionário {nome_aba: query_sql}
             output_file: Caminho do arquivo Excel
@@ -260,12 +886,24 @@ class PostgreSQLExporter:
             Caminho do arquivo gerado
         """
         try:
+            # Fase 1: executar as queries em paralelo
+            max_workers = max(1, min(len(queries), self.connection_pool.maxconn - 1))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    sheet_name: executor.submit(
+                        self.execute_query,
+                        query,
+                        params.get(sheet_name) if params else None
+                    )
+                    for sheet_name, query in queries.items()
+                }
+
+            # Fase 2: gravar cada resultado em sua aba, em série
             with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
-                for sheet_name, query in queries.items():
-                    query_params = params.get(sheet_name) if params else None
-                    df = self.execute_query(query, query_params)
+                for sheet_name, future in futures.items():
+                    df = future.result()
 
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    df.to_excel(writer, sheet_name=sheet_name, index=False, header=False, startrow=1)
 
                     # Formatação básica
                     worksheet = writer.sheets[sheet_name]
@@ -286,8 +924,8 @@ class PostgreSQLExporter:
             raise
 
     def close(self):
-        """Fecha todas as conexões do pool."""
-        if self.connection_pool:
+        """Fecha todas as conexões do pool (pools compartilhados ficam abertos)."""
+        if self.connection_pool and not self.shared_pool:
             self.connection_pool.closeall()
             logger.info("Pool de conexões fechado")
 
@@ -305,6 +943,9 @@ def quick_export(
     """
     Função de conveniência para exportação rápida sem criar instância.
 
+    O pool de conexões é compartilhado entre chamadas com as mesmas
+    credenciais e fechado apenas ao final do processo.
+
     Args:
         query: Query SQL
         output_file: Arquivo Excel de saída
@@ -313,8 +954,5 @@ def quick_export(
     Returns:
         Caminho do arquivo gerado
     """
-    exporter = PostgreSQLExporter(host, database, user, password, port)
-    try:
-        return exporter.query_to_excel(query, output_file)
-    finally:
-        exporter.close()
+    exporter = PostgreSQLExporter(host, database, user, password, port, shared_pool=True)
+    return exporter.query_to_excel(query, output_file)
@@ -105,9 +105,38 @@ def exemplo_rapido():
     )
 
 
+# ========== EXEMPLO 5: Agregação no servidor ==========
+def exemplo_agregado():
+    exporter = PostgreSQLExporter(
+        host='localhost',
+        database='dicom',
+        user='postgres',
+        password='sua_senha'
+    )
+
+    try:
+        # Resumo por modalidade calculado pelo PostgreSQL, sem trazer a tabela inteira
+        exporter.query_to_excel(
+            "SELECT * FROM dicom_studies",
+            "resumo_modalidades.xlsx",
+            aggregate={
+                'group_by': ['modality'],
+                'metrics': {
+                    'total_estudos': 'COUNT(*)',
+                    'total_pacientes': 'COUNT(DISTINCT patient_id)'
+                }
+            },
+            work_mem='256MB'
+        )
+
+    finally:
+        exporter.close()
+
+
 if __name__ == '__main__':
     # Executar exemplos
     exemplo_basico()
     # exemplo_parametrizado()
     # exemplo_multiplas_abas()
     # exemplo_rapido()
+    # exemplo_agregado()
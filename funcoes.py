@@ -1,6 +1,22 @@
 import datetime
 import calendar
 import random
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Alfabeto da senha: letras + caracteres + digitos, montado uma única vez
+_ALFABETO = tuple('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!@#$%&-012345689')
+_CHOICES = random.choices
+
+# Tudo que não é dígito
+_NAO_DIGITOS = re.compile(r'\D+')
+
+# Dias da semana, 0 = segunda .... 6 domingo
+_DIAS = ("segunda", "terca", "quarta", "quinta", "sexta", "sabado", "domingo")
+_DIAS_ARR = np.array(_DIAS)
+
 
 def gera_senha(tamanho):
     """
@@ -8,11 +24,7 @@ def gera_senha(tamanho):
     :param tamanho: Tamanho da senha
     :return: Senha em texto
     """
-    letras = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    caracteres = '!@#$%&-'
-    digitos = '012345689'
-    geral = letras + caracteres + digitos
-    return "".join(random.choices(geral, k=tamanho))
+    return "".join(_CHOICES(_ALFABETO, k=tamanho))
 
 
 def so_numeros(texto):
@@ -21,7 +33,7 @@ def so_numeros(texto):
     :param texto:
     :return: texto somente com os numeros
     """
-    return ''.join(caractere for caractere in texto if caractere.isdigit())
+    return _NAO_DIGITOS.sub('', texto)
 
 
 def dia_da_semana(dia):
@@ -30,9 +42,18 @@ def dia_da_semana(dia):
     :param dia: 0 = segunda .... 7 domingo
     :return: texto de dia da semana
     """
-    dias = ["segunda", "terca", "quarta", "quinta", "sexta", "sabado", "domingo"]
-    return dias[dia]
+    return _DIAS[dia]
+
+
+def dias_da_semana(dias):
+    """
+    Versão vetorizada de dia_da_semana para arrays de dias
+    :param dias: array (ou lista) de inteiros, 0 = segunda .... 6 domingo
+    :return: array NumPy com os textos dos dias da semana
+    """
+    return _DIAS_ARR[np.asarray(dias)]
 
+@lru_cache(maxsize=4096)
 def datas_do_mes(ano: int, mes: int):
     """
     Função de retorna a data inicial e final do mês